@@ -1,5 +1,17 @@
-from .pipe import (pipe, pfilter, pmap, nth, take, returning, print_return)
-from .misc import (cache, flatten, ignored, printf, print_duration)
+from .pipe import (pipe, compile_pipe, pfilter, pmap, nth, take, returning,
+                   print_return)
+from .misc import (cache, flatten, ignored, jit_cache, printf, print_duration)
+
+try:
+    from . import _fast
+except ImportError:  # pelper was installed without Cython
+    pass
+else:
+    # the compiled helpers are documented by their python versions
+    for _f in (pipe, pfilter, pmap, nth, take, flatten):
+        getattr(_fast, _f.__name__).__doc__ = _f.__doc__
+    del _f
+    from ._fast import (pipe, pfilter, pmap, nth, take, flatten)  # noqa
 
 __version__ = "0.1.0"
 __all__ = [
@@ -8,10 +20,12 @@ __all__ = [
     "cache",
     "flatten",
     "ignored",
+    "jit_cache",
     "printf",
     "print_duration",
 
     "pipe",
+    "compile_pipe",
     "pfilter",
     "pmap",
     "nth",
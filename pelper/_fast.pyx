@@ -0,0 +1,85 @@
+# cython: language_level=3str, binding=True
+"""Compiled versions of the small helpers from `pelper.pipe` and
+`pelper.misc`.
+
+The extension is only built if Cython and a C compiler are available when
+pelper is installed. ``pelper/__init__.py`` falls back to the pure python
+versions otherwise and copies their docstrings onto the compiled ones.
+Keep the behavior in sync with the python versions:
+``tests/test_fast.py`` runs their doctests against this module.
+"""
+from itertools import islice
+
+
+_SEQUENCES = (list, tuple, type(range(0)), str, bytes)
+
+
+###############################################################################
+def pipe(data, *functions):
+    """Compiled version of `pelper.pipe.pipe`."""
+    cdef object f
+    for f in functions:
+        if isinstance(f, tuple):
+            if len(f) > 1 and isinstance(f[1], dict):
+                data = f[0](data, **f[1])
+            else:
+                data = f[0](data, *f[1:])
+        else:
+            data = f(data)
+    return data
+
+
+###############################################################################
+cdef tuple _STRINGS = (str, bytes, bytearray)
+
+
+cdef inline bint _is_leaf(object e):
+    if isinstance(e, (list, tuple)):
+        return False
+    return isinstance(e, _STRINGS) or not hasattr(e, "__iter__")
+
+
+cpdef list flatten(object nested_list):
+    """Compiled version of `pelper.misc.flatten`."""
+    if _is_leaf(nested_list):
+        return [nested_list]
+
+    cdef list result = []
+    cdef list stack = [iter(nested_list)]
+    cdef object e
+    while stack:
+        for e in stack[-1]:
+            if _is_leaf(e):
+                result.append(e)
+            else:
+                stack.append(iter(e))
+                break
+        else:
+            stack.pop()
+    return result
+
+
+###############################################################################
+cpdef list take(object iterable, object n):
+    """Compiled version of `pelper.pipe.take`."""
+    if isinstance(iterable, _SEQUENCES) and isinstance(n, int) and n >= 0:
+        return list(iterable[:n])
+    return list(islice(iterable, n))
+
+
+cpdef object nth(object iterable, object n, object default=None):
+    """Compiled version of `pelper.pipe.nth`."""
+    if isinstance(iterable, _SEQUENCES) and isinstance(n, int) and n >= 0:
+        return iterable[n] if n < len(iterable) else default
+    return next(islice(iterable, n, None), default)
+
+
+###############################################################################
+def pmap(iterable, fn):
+    """Compiled version of `pelper.pipe.pmap`."""
+    return map(fn, iterable)
+
+
+def pfilter(iterable, fn):
+    """Compiled version of `pelper.pipe.pfilter`."""
+    return filter(fn, iterable)
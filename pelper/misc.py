@@ -1,7 +1,46 @@
 from __future__ import print_function
-from contextlib import contextmanager
-from functools import wraps
+from functools import partial, wraps
+from inspect import CO_VARARGS, CO_VARKEYWORDS
+import sys
+from threading import Event, Lock, current_thread
 import time
+from types import FunctionType
+
+try:
+    from functools import cache as _memoize
+except ImportError:  # python < 3.9
+    _memoize = None
+    if sys.version_info < (3, 5):
+        # no C implementation of lru_cache, prefer fastcache's if installed
+        try:
+            from fastcache import clru_cache
+            _memoize = clru_cache(maxsize=None)
+        except ImportError:
+            pass
+    if _memoize is None:
+        try:
+            from functools import lru_cache
+            _memoize = lru_cache(maxsize=None)
+        except ImportError:  # python 2.7
+            pass
+
+try:
+    from contextlib import suppress as _suppress
+except ImportError:  # python 2.7
+    _suppress = None
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # python < 3.7
+    _clock = getattr(time, "perf_counter", time.time)
+
+    def perf_counter_ns():
+        return int(_clock() * 1e9)
+
+
+# nested types flatten checks first, and iterables it does not flatten
+_CONTAINERS = (list, tuple)
+_STRINGS = (str, bytes, bytearray)
 
 
 ###############################################################################
@@ -40,6 +79,13 @@ class print_duration(object):
         [0, 1, 2, 3, 4]
         range test 0...s
 
+        The message can be any object:
+
+        >>> with print_duration(123):  #doctest: +ELLIPSIS
+        ...    list(range(5))
+        [0, 1, 2, 3, 4]
+        123 0...s
+
         Use your logger:
 
         >>> import logging
@@ -62,47 +108,84 @@ class print_duration(object):
         >>> f()  #doctest: +ELLIPSIS
         f took 0...s
 
+        Keyword arguments are passed on to the decorated function:
+
+        >>> @print_duration("g took")
+        ... def g(n, step=1):
+        ...     return list(range(0, n, step))
+        >>> g(5, step=2)  #doctest: +ELLIPSIS
+        g took 0...s
+        [0, 2, 4]
+
     """
+    __slots__ = ("msg", "out", "start", "_fmt")
+
     def __init__(self, msg=None, out=None):
         self.msg = msg
         self.out = print if out is None else out
+        if msg:
+            escaped = "{}".format(msg).replace("{", "{{").replace("}", "}}")
+            fmt = escaped + " {:.6f}s"
+        else:
+            fmt = "Duration {:.6f}s"
+        self._fmt = fmt.format
 
     def __enter__(self):
-        self.start = time.time()
+        self.start = perf_counter_ns()
 
     def __exit__(self, type, value, traceback):
-        duration = time.time() - self.start
-        if self.msg:
-            self.out("{} {:.6f}s".format(self.msg, duration))
-        else:
-            self.out("Duration {:.6f}s".format(duration))
+        self.out(self._fmt((perf_counter_ns() - self.start) / 1e9))
 
     def __call__(self, func):
+        fmt, out, clock = self._fmt, self.out, perf_counter_ns
+
         @wraps(func)
-        def wrapped_func(*args):
-            self.__enter__()
-            result = func(*args)
-            # TODO don't pass None
-            self.__exit__(None, None, None)
-            return result
+        def wrapped_func(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                out(fmt((clock() - start) / 1e9))
 
         return wrapped_func
 
 
 ###############################################################################
-def cache(f):
+def cache(f=None, jit=False):
     """Decorator: cache the results of f for the same parameters.
 
     The decorated function is only called if the parameters differ from
     previous calls.
     Cache is really useful for recursive functions!
 
+    ``cache`` uses the C implementation of ``functools.cache`` or
+    ``functools.lru_cache`` if it is available.
+    Python 2.7 and 3.4 have no C implementation, there ``cache`` uses
+    ``fastcache.clru_cache`` if fastcache is installed and a pure python
+    version otherwise.
+
     Args:
         f (function): the function to cache.
+        jit (bool, optional): compile ``f`` with ``numba.njit`` before
+            caching it.
+            ``f`` runs uncompiled if numba is not installed or if numba
+            can't compile it for the given arguments.
+            Defaults to ``False``.
 
     Warning:
         Only use this with pure functions!
 
+    Note:
+        Only jit numeric functions that do real work.
+        Calling a jitted function has a dispatch overhead of roughly a
+        microsecond and the first call pays for the compilation.
+        Recursive functions run uncompiled: they call the cached wrapper,
+        not themselves, and numba can't compile that call.
+        Compiled functions return numba types, e.g., a ``dict`` built inside
+        the function comes back as a ``numba.typed.Dict``, and compute with
+        64-bit integers, so results that don't fit into 64 bits differ from
+        plain python.
+
     Examples:
         >>> # try the normal fib
         >>> def fib(n):
@@ -121,24 +204,200 @@ def cache(f):
         75025
         Duration 0...s
 
+        Compile numeric functions with numba (if it is installed):
+
+        >>> @cache(jit=True)
+        ... def collatz_steps(n):
+        ...     steps = 0
+        ...     while n != 1:
+        ...         n = n // 2 if n % 2 == 0 else 3 * n + 1
+        ...         steps += 1
+        ...     return steps
+        >>> collatz_steps(27)
+        111
+
     """
-    saved = {}
+    if f is None:
+        return partial(cache, jit=jit)
+    if jit:
+        f = _maybe_jit(f)
+    if _memoize is not None:
+        return _memoize(f)
+    return _cache(f)
+
+
+def jit_cache(f):
+    """Decorator: compile f with numba and cache its results.
+
+    Shortcut for ``cache(f, jit=True)``.
+    ``f`` is cached without compiling it if numba is not installed, and
+    runs uncompiled if numba can't compile it for the given arguments.
+
+    Args:
+        f (function): a numeric function.
+
+    Examples:
+        >>> @jit_cache
+        ... def hypot(a, b):
+        ...     return (a * a + b * b) ** 0.5
+        >>> hypot(3.0, 4.0)
+        5.0
+
+    """
+    return cache(f, jit=True)
+
+
+def _maybe_jit(f):
+    """Return a function that runs ``f`` compiled by ``numba.njit``.
+
+    numba compiles lazily on the first call for each argument type.
+    If it can't compile ``f`` for the given arguments, e.g., because ``f``
+    calls itself through the cache, the returned function calls ``f`` itself
+    from then on.
+    ``f`` is returned as is if numba is not installed or if ``f`` is not a
+    plain function, e.g., a bound method.
+    """
+    if not isinstance(f, FunctionType):
+        return f
+    try:
+        import numba
+        from numba.core.errors import NumbaError
+    except ImportError:
+        return f
+
+    try:
+        # closures can't be cached on disk
+        jitted = numba.njit(cache=not f.__closure__)(f)
+    except RuntimeError:  # no file to cache to, e.g., in a doctest
+        jitted = numba.njit(f)
+    impl = [jitted]
 
     @wraps(f)
-    def newfunc(*args):
-        if args in saved:
-            return saved[args]
-        result = f(*args)
-        saved[args] = result
-        return result
+    def call(*args, **kwargs):
+        try:
+            return impl[0](*args, **kwargs)
+        except NumbaError:
+            impl[0] = f
+            return f(*args, **kwargs)
+    return call
+
+
+def _cache(f):
+    """Pure python version of `cache` for pythons without ``lru_cache``.
+
+    Hits are a single dict lookup without locking.
+    On a miss only one thread calls ``f`` for the given arguments, other
+    threads asking for the same arguments wait for its result.
+    A thread never waits for its own call, so ``f`` calling itself with the
+    same arguments recurses as without the cache.
+    Functions with exactly one positional parameter are keyed on the
+    argument itself, which saves packing it into a tuple on every call.
+    """
+    saved = {}
+    saved_get = saved.__getitem__
+    saved_set = saved.__setitem__
+    in_flight = {}
+    lock = Lock()
+
+    def claim(key):
+        """Return the Event to set once the caller has saved ``key``.
+
+        Returns None if the result is saved by now, possibly after waiting for
+        the thread that computes it, or if that thread failed and the caller
+        should try again.
+        Returns False if the calling thread is computing ``key`` already.
+        """
+        me = current_thread()
+        with lock:
+            if key in saved:
+                return None
+            event, owner = in_flight.get(key, (None, None))
+            if event is None:
+                event = Event()
+                in_flight[key] = event, me
+                return event
+        if owner is me:
+            return False
+        event.wait()
+        return None
+
+    def release(key, event):
+        with lock:
+            del in_flight[key]
+        event.set()
+
+    # the miss path is written out in newfunc instead of calling a helper
+    # that calls f: every stack frame counts for recursive functions
+    if _has_single_parameter(f):
+        @wraps(f)
+        def newfunc(arg):
+            try:
+                return saved_get(arg)
+            except KeyError:
+                pass
+            event = claim(arg)
+            if event is None:
+                return newfunc(arg)
+            if event is False:  # f calls itself with the same argument
+                return f(arg)
+            try:
+                result = f(arg)
+                saved_set(arg, result)
+                return result
+            finally:
+                release(arg, event)
+    else:
+        @wraps(f)
+        def newfunc(*args):
+            try:
+                return saved_get(args)
+            except KeyError:
+                pass
+            event = claim(args)
+            if event is None:
+                return newfunc(*args)
+            if event is False:  # f calls itself with the same arguments
+                return f(*args)
+            try:
+                result = f(*args)
+                saved_set(args, result)
+                return result
+            finally:
+                release(args, event)
     return newfunc
 
 
+def _has_single_parameter(f):
+    """Return True if ``f`` is a function with one positional parameter."""
+    if not isinstance(f, FunctionType) or f.__defaults__:
+        return False
+    code = f.__code__
+    return (code.co_argcount == 1 and
+            not code.co_flags & (CO_VARARGS | CO_VARKEYWORDS) and
+            not getattr(code, "co_kwonlyargcount", 0))
+
+
 ###############################################################################
-@contextmanager
-def ignored(*exception):
+if _suppress is None:
+    class _suppress(object):
+        """Python 2.7 version of ``contextlib.suppress``."""
+        __slots__ = ("_exceptions",)
+
+        def __init__(self, *exceptions):
+            self._exceptions = exceptions
+
+        def __enter__(self):
+            pass
+
+        def __exit__(self, type, value, traceback):
+            return type is not None and issubclass(type, self._exceptions)
+
+
+class ignored(_suppress):
     """Context manager to ignore exceptions.
 
+    ``ignored`` is ``contextlib.suppress`` under a different name.
+
     Args:
         exception (Exception): the exception to ignore
 
@@ -146,11 +405,17 @@ def ignored(*exception):
         >>> with ignored(OSError):
         ...     raise OSError  # this is ignored!
 
+        Other exceptions are raised as usual:
+
+        >>> with ignored(OSError, KeyError):
+        ...     raise ValueError("not ignored")
+        Traceback (most recent call last):
+        ...
+        ValueError: not ignored
+
     """
-    try:
-        yield
-    except exception:
-        pass
+    # only avoids a __dict__ with the python 2.7 base, suppress has no slots
+    __slots__ = ()
 
 
 ###############################################################################
@@ -178,13 +443,28 @@ def flatten(nested_list):
         >>> flatten(["one", ["two", "three", ["four"]]])
         ['one', 'two', 'three', 'four']
 
+        >>> strings = [b"one", bytearray(b"two")]
+        >>> flatten([strings[0], [strings[1]]]) == strings
+        True
+
     """
-    if not hasattr(nested_list, "__iter__") or isinstance(nested_list, str):
+    if not isinstance(nested_list, _CONTAINERS) and (
+            isinstance(nested_list, _STRINGS) or
+            not hasattr(nested_list, "__iter__")):
         return [nested_list]
 
     result = []
-    for e in nested_list:
-        result.extend(flatten(e))
+    append = result.append
+    stack = [iter(nested_list)]
+    while stack:
+        for e in stack[-1]:
+            if isinstance(e, _CONTAINERS) or (
+                    hasattr(e, "__iter__") and not isinstance(e, _STRINGS)):
+                stack.append(iter(e))
+                break
+            append(e)
+        else:
+            stack.pop()
     return result
 
 
@@ -2,6 +2,15 @@ from __future__ import print_function
 from itertools import islice
 
 
+# types that support O(1) indexing and slicing; type(range(0)) is list on 2.7
+_SEQUENCES = (list, tuple, type(range(0)), str, bytes)
+
+try:
+    _INTS = (int, long)  # noqa: F821
+except NameError:  # python 3
+    _INTS = (int,)
+
+
 ###############################################################################
 def pipe(data, *functions):
     """pipe data trough a pipeline of functions.
@@ -72,10 +81,20 @@ def pipe(data, *functions):
         ...      (sorted, {"reverse": True}))
         ['t', 's', 'n', 'h', 'd', 'b', 'a']
 
+        Without functions the data is returned as is:
+
+        >>> pipe(text)
+        'atababsatsatsastatbadstssdhhhnbb'
+
+        A tuple with only a function calls it with the data alone:
+
+        >>> pipe(-3, (abs,))
+        3
+
     """
     for f in functions:
         if isinstance(f, tuple):
-            if isinstance(f[1], dict):
+            if len(f) > 1 and isinstance(f[1], dict):
                 data = f[0](data, **f[1])
             else:
                 data = f[0](data, *f[1:])
@@ -84,6 +103,103 @@ def pipe(data, *functions):
     return data
 
 
+###############################################################################
+def compile_pipe(*functions):
+    """Compile a pipeline of functions into a single function.
+
+    ``compile_pipe`` accepts the same functions as ``pipe`` but resolves the
+    tuple and dict shortcuts only once.
+    Use it if you call the same pipeline many times, e.g., in a loop, and
+    create the pipeline outside of the loop.
+    Compiling is much slower than running a short pipeline once.
+
+    Args:
+        functions (callables): functions that create the pipeline.
+
+    Returns:
+        callable: a function that pipes its argument through the pipeline.
+
+    Examples:
+        >>> from math import sqrt
+        >>> p = compile_pipe(float, int, (pow, 2), sqrt)
+        >>> p("3.7")
+        3.0
+
+        >>> [p(x) for x in ["1.1", "2.2"]]
+        [1.0, 2.0]
+
+        >>> compile_pipe(set, (sorted, {"reverse": True}))("abca")
+        ['c', 'b', 'a']
+
+        The pipe helpers work as usual:
+
+        >>> p = compile_pipe(
+        ...     (pmap, lambda x: x * x),
+        ...     (pfilter, lambda x: x > 2),
+        ...     list,
+        ...     print_return,
+        ...     (returning, print, "squares"),
+        ...     sum)
+        >>> p(range(4))
+        [4, 9]
+        [4, 9] squares
+        13
+
+        Long pipelines work, too:
+
+        >>> compile_pipe(*[abs] * 300)(-1)
+        1
+
+    """
+    # compile_pipe(float, (pow, 2), (sorted, {"reverse": True})) becomes
+    #
+    #     def _pipe(data):
+    #         data = _f0(data)
+    #         data = _f1(data, _a1_0)
+    #         data = _f2(data, **_kw2)
+    #         return data
+    #
+    # pmap, pfilter, returning, and print_return stages are written out,
+    # e.g., (pmap, fn) becomes "data = map(_a0_0, data)"
+    #
+    # the stages are globals of the generated function, not parameters of a
+    # factory: python < 3.7 allows at most 255 parameters
+    names = {}
+    lines = []
+    for i, f in enumerate(functions):
+        fn = "_f%d" % i
+        if isinstance(f, tuple):
+            if len(f) > 1 and isinstance(f[1], dict):
+                names[fn] = f[0]
+                names["_kw%d" % i] = f[1]
+                lines.append("data = %s(data, **_kw%d)" % (fn, i))
+                continue
+            args = ["_a%d_%d" % (i, j) for j in range(len(f) - 1)]
+            names.update(zip(args, f[1:]))
+            inline = _INLINE.get(id(f[0]))
+            if inline in ("map", "filter") and len(args) == 1:
+                lines.append("data = %s(%s, data)" % (inline, args[0]))
+            elif inline == "returning" and args:
+                call = ", ".join(["data"] + args[1:])
+                lines.append("%s(%s)" % (args[0], call))
+            else:
+                names[fn] = f[0]
+                call = ", ".join(["data"] + args)
+                lines.append("data = %s(%s)" % (fn, call))
+        elif _INLINE.get(id(f)) == "print_return":
+            names[fn] = print
+            lines.append("%s(data)" % fn)
+        else:
+            names[fn] = f
+            lines.append("data = %s(data)" % fn)
+    lines.append("return data")
+
+    source = "def _pipe(data):\n"
+    source += "".join("    %s\n" % line for line in lines)
+    exec(source, names)
+    return names["_pipe"]
+
+
 ###############################################################################
 def take(iterable, n):
     """Return first n items of the iterable as a list
@@ -101,7 +217,24 @@ def take(iterable, n):
 
         >>> take(range(5), 0)
         []
+
+        >>> take(iter(range(5)), 2)
+        [0, 1]
+
+        >>> take("hello world", 5)
+        ['h', 'e', 'l', 'l', 'o']
+
+        Like ``islice``, ``n=None`` takes everything:
+
+        >>> take([1, 2, 3], None)
+        [1, 2, 3]
+
+        >>> take("abc", None)
+        ['a', 'b', 'c']
     """
+    if isinstance(iterable, _SEQUENCES) and isinstance(n, _INTS) and n >= 0:
+        head = iterable[:n]
+        return head if type(head) is list else list(head)
     return list(islice(iterable, n))
 
 
@@ -130,7 +263,18 @@ def nth(iterable, n, default=None):
 
         >>> nth(range(5), 6, default="Hello")
         'Hello'
+
+        >>> nth(iter(range(5)), 2)
+        2
+
+        >>> nth([1, 2, 3], None)
+        1
+
+        >>> nth("abc", None)
+        'a'
     """
+    if isinstance(iterable, _SEQUENCES) and isinstance(n, _INTS) and n >= 0:
+        return iterable[n] if n < len(iterable) else default
     return next(islice(iterable, n, None), default)
 
 
@@ -238,3 +382,18 @@ def print_return(data):
         'SOME TEXT'
     """
     return returning(data, print)
+
+
+# stages that compile_pipe writes out instead of calling them
+_INLINE = {
+    id(pmap): "map",
+    id(pfilter): "filter",
+    id(returning): "returning",
+    id(print_return): "print_return",
+}
+try:
+    from ._fast import pmap as _fast_pmap, pfilter as _fast_pfilter
+    _INLINE[id(_fast_pmap)] = "map"
+    _INLINE[id(_fast_pfilter)] = "filter"
+except ImportError:  # pelper was installed without Cython
+    pass
@@ -4,11 +4,25 @@
 import os
 from setuptools import setup
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 
 with open(os.path.join(os.path.dirname(__file__), "README.rst")) as f:
     long_description = f.read()
 
 
+# the compiled helpers are optional, see pelper/_fast.pyx
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(["pelper/_fast.pyx"])
+    for ext in ext_modules:
+        # don't fail the install without a C compiler
+        ext.optional = True
+
+
 setup(
     name="pelper",
 
@@ -28,4 +42,12 @@ setup(
     keywords="development heper functional decorator contextmanager",
 
     packages=["pelper"],
+
+    ext_modules=ext_modules,
+
+    extras_require={
+        # the standard library's cache is faster from python 3.5 on
+        "fast": ['fastcache; python_version < "3.5"'],
+        "jit": ["numba"],
+    },
 )
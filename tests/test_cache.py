@@ -0,0 +1,107 @@
+from threading import Thread
+import time
+
+import pytest
+
+from pelper.misc import _cache
+
+
+class Counter(object):
+    def __init__(self):
+        self.calls = 0
+
+    def count(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_single_parameter_function():
+    calls = []
+
+    @_cache
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+
+
+def test_bound_method_without_parameters():
+    counter = Counter()
+    count = _cache(counter.count)
+
+    assert [count(), count()] == [1, 1]
+
+
+def run_in_threads(func, n=8):
+    results = []
+    threads = [Thread(target=lambda: results.append(func()))
+               for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_call_f_once():
+    calls = []
+
+    @_cache
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.1)
+        return x * 2
+
+    assert run_in_threads(lambda: slow(3)) == [6] * 8
+    assert calls == [3]
+
+
+def test_waiting_threads_retry_when_the_owner_fails():
+    calls = []
+
+    @_cache
+    def flaky(x):
+        calls.append(x)
+        time.sleep(0.1)
+        if len(calls) == 1:
+            raise ValueError("first call fails")
+        return x * 2
+
+    def call():
+        try:
+            return flaky(3)
+        except ValueError:
+            return "failed"
+
+    results = run_in_threads(call, n=4)
+    assert sorted(results, key=str) == [6, 6, 6, "failed"]
+    assert calls == [3, 3]
+
+
+def test_recursion_with_the_same_arguments_does_not_deadlock():
+    @_cache
+    def forever(x):
+        return forever(x)
+
+    # RecursionError is a RuntimeError, python 2.7 only has the latter
+    with pytest.raises(RuntimeError):
+        forever(1)
+
+
+def test_recursion_adds_only_one_frame_per_call():
+    def depth(n):
+        return 0 if n == 0 else depth(n - 1) + 1
+
+    limit = 0
+    while True:
+        try:
+            depth(limit + 10)
+        except RuntimeError:
+            break
+        limit += 10
+
+    # the cached function calls the wrapper, which calls the function
+    depth = _cache(depth)
+    assert depth(limit // 2 - 10) == limit // 2 - 10
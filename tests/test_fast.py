@@ -0,0 +1,37 @@
+import doctest
+from importlib import import_module
+
+import pytest
+
+_fast = pytest.importorskip("pelper._fast")
+
+# compiled helper -> module of its python version
+HELPERS = {
+    "pipe": "pelper.pipe",
+    "take": "pelper.pipe",
+    "nth": "pelper.pipe",
+    "pmap": "pelper.pipe",
+    "pfilter": "pelper.pipe",
+    "flatten": "pelper.misc",
+}
+
+
+@pytest.mark.parametrize("name", sorted(HELPERS))
+def test_python_doctests_pass_with_compiled_helpers(name):
+    module = import_module(HELPERS[name])
+    globs = dict(vars(module))
+    globs.update((helper, getattr(_fast, helper)) for helper in HELPERS)
+    test = doctest.DocTestParser().get_doctest(
+        getattr(module, name).__doc__, globs, name, module.__file__, 0)
+    runner = doctest.DocTestRunner(optionflags=doctest.ELLIPSIS)
+    runner.run(test)
+    assert runner.failures == 0
+
+
+@pytest.mark.parametrize("name", sorted(HELPERS))
+def test_compiled_helpers_are_exported_with_python_docs(name):
+    import pelper
+
+    assert getattr(pelper, name) is getattr(_fast, name)
+    python = getattr(import_module(HELPERS[name]), name)
+    assert getattr(pelper, name).__doc__ == python.__doc__
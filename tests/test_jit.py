@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from pelper import cache, jit_cache
+from pelper.misc import _maybe_jit
+
+numba = pytest.importorskip("numba")
+
+
+def test_numeric_function_is_compiled():
+    @cache(jit=True)
+    def mul(a, b):
+        return a * b
+
+    # only the compiled version wraps around at 64 bits
+    assert mul(2 ** 40, 2 ** 40) == 0
+
+
+def test_jit_cache_compiles_and_caches():
+    @jit_cache
+    def mul(a, b):
+        return a * b
+
+    assert [mul(2 ** 40, 2 ** 40), mul(2 ** 40, 2 ** 40)] == [0, 0]
+    assert mul.cache_info().hits == 1
+
+
+def test_keyword_arguments_are_passed_on():
+    def scale(x, factor=2):
+        return x * factor
+
+    jitted = _maybe_jit(scale)
+    assert jitted(3, factor=4) == 12
+    assert jitted(3.0, factor=0.5) == 1.5
+
+
+def test_functions_using_their_own_name_as_attribute_are_compiled():
+    def sqrt(x):
+        return math.sqrt(x)
+
+    def real(z):
+        return z.real * 2
+
+    assert _maybe_jit(sqrt) is not sqrt
+    assert _maybe_jit(sqrt)(4.0) == 2.0
+    assert _maybe_jit(real) is not real
+    assert _maybe_jit(real)(3 + 4j) == 6.0
+
+
+def test_bound_method_is_not_compiled():
+    class Counter(object):
+        def double(self, x):
+            return 2 * x
+
+    double = Counter().double
+    assert _maybe_jit(double) is double
+    assert cache(double, jit=True)(3) == 6
+
+
+def test_recursive_function_falls_back_to_cache():
+    @cache(jit=True)
+    def fib(n):
+        return 1 if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(80) == 37889062373143906
+
+
+def test_uncompilable_function_falls_back_at_call_time():
+    @cache(jit=True)
+    def type_names(xs):
+        return tuple(type(x).__name__ for x in xs)
+
+    assert type_names((1, "a")) == ("int", "str")
+    assert type_names((1.0,)) == ("float",)